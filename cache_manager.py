@@ -0,0 +1,230 @@
+import os, json, time
+from pathlib import Path
+from install_cache import LaunchCache, CACHE_DIR_NAME
+from mod_sets import SETS_DIR, ACTIVE_MARKER, INSTALLED_RECORD
+
+class CleanupPlan:
+    """Resultado de planificar una limpieza, antes de borrar nada"""
+
+    def __init__(self, victims, reclaim_bytes):
+        self.victims = victims            # [(tipo, nombre, [archivos])]
+        self.reclaim_bytes = reclaim_bytes
+
+    def is_empty(self):
+        return not self.victims
+
+    def describe(self):
+        names = [name for _, name, _ in self.victims]
+        return f"{self.reclaim_bytes / (1024 * 1024):.1f} MB ({', '.join(names)})"
+
+# ---------------------------------------------------------
+# CACHE MANAGER
+# ---------------------------------------------------------
+class CacheManager:
+    """Registra el último uso de versiones y conjuntos de mods y aplica un
+    presupuesto de disco expulsando primero lo usado hace más tiempo (LRU).
+
+    Los archivos compartidos (librerías, assets) solo se borran cuando ninguna
+    otra versión los referencia, y no se expulsa una versión cuya carpeta aún
+    usa otra ni una versión padre (inheritsFrom) de otra instalada. Si alguna
+    versión instalada no tiene foto en LaunchCache no se conocen sus
+    dependencias, y entonces solo se borra la propia carpeta de cada versión.
+
+    De los conjuntos de mods guardados solo se borran los jars que descargó el
+    launcher (INSTALLED_RECORD); los que puso el usuario se conservan.
+    """
+
+    def __init__(self, mc_dir, budget_mb=0):
+        self.mc_dir = Path(mc_dir)
+        self.budget_bytes = int(budget_mb) * 1024 * 1024
+        self.launch_cache = LaunchCache(mc_dir)
+        self.usage_path = self.mc_dir / CACHE_DIR_NAME / "usage.json"
+
+    # ----------------------------------------
+    # USAGE
+    # ----------------------------------------
+    def load_usage(self):
+        try:
+            with open(self.usage_path, encoding="utf-8") as f:
+                usage = json.load(f)
+        except (OSError, ValueError):
+            usage = {}
+        usage.setdefault("versions", {})
+        usage.setdefault("mods", {})
+        return usage
+
+    def save_usage(self, usage):
+        self.usage_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = str(self.usage_path) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(usage, f, indent=4)
+        os.replace(temp_path, self.usage_path)
+
+    def touch(self, kind, name):
+        """Marca una versión ("versions") o conjunto de mods ("mods") como usado ahora"""
+        usage = self.load_usage()
+        usage[kind][name] = time.time()
+        self.save_usage(usage)
+
+    # ----------------------------------------
+    # ENTRIES
+    # ----------------------------------------
+    def _walk(self, directory):
+        files = set()
+        for root, _, names in os.walk(directory):
+            files.update(os.path.abspath(os.path.join(root, n)) for n in names)
+        return files
+
+    def installed_versions(self):
+        versions_dir = self.mc_dir / "versions"
+        if not versions_dir.is_dir():
+            return []
+        return [p.name for p in versions_dir.iterdir() if p.is_dir()]
+
+    def entry_dir(self, kind, name):
+        if kind == "versions":
+            return self.mc_dir / "versions" / name
+        # El conjunto activo está en `mods` y nunca se expulsa
+        return self.mc_dir / SETS_DIR / name
+
+    def parent_versions(self):
+        """Versiones de las que hereda (inheritsFrom) alguna versión instalada"""
+        parents = set()
+        for version in self.installed_versions():
+            try:
+                with open(self.entry_dir("versions", version) / f"{version}.json", encoding="utf-8") as f:
+                    parent = json.load(f).get("inheritsFrom")
+            except (OSError, ValueError):
+                continue
+            if parent:
+                parents.add(parent)
+        return parents
+
+    def recorded_mods(self, name):
+        """Jars de un conjunto guardado que descargó el launcher"""
+        set_dir = self.entry_dir("mods", name)
+        try:
+            with open(set_dir / INSTALLED_RECORD, encoding="utf-8") as f:
+                names = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        return {os.path.abspath(set_dir / n) for n in names if (set_dir / n).is_file()}
+
+    def entries(self):
+        """({(tipo, nombre): archivos}, si se conocen las dependencias de todas las versiones)"""
+        versions = self.installed_versions()
+        plans = {v: self.launch_cache.load(v) for v in versions}
+
+        entries = {}
+        for version in versions:
+            files = self._walk(self.entry_dir("versions", version))
+            # Las fotos existentes siempre cuentan, aunque a otras versiones les falte
+            if plans[version]:
+                files.update(os.path.abspath(p) for p in plans[version].get("files", {}))
+            entries[("versions", version)] = files
+        sets_dir = self.mc_dir / SETS_DIR
+        if sets_dir.is_dir():
+            for p in sets_dir.iterdir():
+                files = self.recorded_mods(p.name) if p.is_dir() else set()
+                if files:
+                    entries[("mods", p.name)] = files
+        return entries, all(plans.values())
+
+    # ----------------------------------------
+    # PLAN + CLEANUP
+    # ----------------------------------------
+    def _size(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def plan_cleanup(self, keep=()):
+        """Calcula qué se borraría y cuánto espacio se liberaría, sin borrar nada.
+
+        `keep` son pares (tipo, nombre) que nunca se expulsan.
+        """
+        entries, shared_safe = self.entries()
+        reclaim = 0
+        victims = []
+
+        if self.budget_bytes <= 0:
+            return CleanupPlan(victims, reclaim)
+
+        refcount = {}
+        for files in entries.values():
+            for path in files:
+                refcount[path] = refcount.get(path, 0) + 1
+        total = sum(self._size(p) for p in refcount)
+
+        parents = self.parent_versions()
+        usage = self.load_usage()
+        lru = sorted(
+            (key for key in entries if key not in keep),
+            key=lambda key: usage[key[0]].get(key[1], 0)
+        )
+        for key in lru:
+            if total - reclaim <= self.budget_bytes:
+                break
+
+            # Una versión padre de otra instalada no se expulsa
+            if key[0] == "versions" and key[1] in parents:
+                continue
+
+            # Si otra entrada usa algo de la carpeta propia, la entrada se conserva
+            own_dir = os.path.abspath(self.entry_dir(*key)) + os.sep
+            if any(refcount[p] > 1 for p in entries[key] if p.startswith(own_dir)):
+                continue
+
+            freed = []
+            for path in entries[key]:
+                refcount[path] -= 1
+                # Sin todas las fotos, fuera de la carpeta propia no se sabe quién más lo usa
+                if refcount[path] == 0 and (shared_safe or path.startswith(own_dir)):
+                    freed.append(path)
+            victims.append((key[0], key[1], freed))
+            reclaim += sum(self._size(p) for p in freed)
+
+        return CleanupPlan(victims, reclaim)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            os.removedirs(os.path.dirname(path))
+        except OSError:
+            pass
+
+    def _remove_empty_dirs(self, directory):
+        for root, _, _ in os.walk(directory, topdown=False):
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
+
+    def _forget_mod_set(self, name):
+        """Quita el registro de un conjunto vaciado; si quedan jars del usuario, se conservan"""
+        set_dir = self.entry_dir("mods", name)
+        leftovers = [p for p in set_dir.iterdir() if p.name not in (ACTIVE_MARKER, INSTALLED_RECORD)] if set_dir.is_dir() else []
+        if leftovers:
+            with open(set_dir / INSTALLED_RECORD, "w", encoding="utf-8") as f:
+                json.dump([], f, indent=4)
+            return
+        for meta in (ACTIVE_MARKER, INSTALLED_RECORD):
+            try:
+                os.remove(set_dir / meta)
+            except OSError:
+                pass
+
+    def run_cleanup(self, plan):
+        """Borra exactamente los archivos de un plan de plan_cleanup"""
+        usage = self.load_usage()
+        for kind, name, files in plan.victims:
+            for path in files:
+                self._remove(path)
+            if kind == "mods":
+                self._forget_mod_set(name)
+            self._remove_empty_dirs(self.entry_dir(kind, name))
+            if kind == "versions":
+                self.launch_cache.invalidate(name)
+            usage[kind].pop(name, None)
+        self.save_usage(usage)
@@ -0,0 +1,115 @@
+import os, json, hashlib
+from pathlib import Path
+
+CACHE_DIR_NAME = "launcher_cache"
+
+# ---------------------------------------------------------
+# LAUNCH CACHE
+# ---------------------------------------------------------
+class LaunchCache:
+    """Guarda por versión una foto de la instalación y el comando de lanzamiento.
+
+    La foto es la lista de archivos de la versión con su tamaño y mtime; si
+    nada cambió se puede lanzar sin volver a verificar toda la instalación.
+    """
+
+    def __init__(self, mc_dir):
+        self.mc_dir = Path(mc_dir)
+        self.cache_dir = self.mc_dir / CACHE_DIR_NAME
+
+    def _plan_path(self, version):
+        return self.cache_dir / f"{version}.json"
+
+    def launch_key(self, version, config):
+        """Clave del plan de lanzamiento: versión, carpeta y configuración"""
+        data = json.dumps({"version": version, "mc_dir": str(self.mc_dir), "config": config}, sort_keys=True)
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    # ----------------------------------------
+    # SNAPSHOT
+    # ----------------------------------------
+    def collect_files(self, version, command):
+        """Archivos de los que depende una versión instalada"""
+        files = set()
+
+        # Carpeta de la versión: json, jar y natives
+        for root, _, names in os.walk(self.mc_dir / "versions" / version):
+            files.update(os.path.join(root, n) for n in names)
+
+        # Librerías del classpath
+        if "-cp" in command:
+            classpath = command[command.index("-cp") + 1]
+            files.update(p for p in classpath.split(os.pathsep) if p)
+
+        # Índice y objetos de assets
+        if "--assetsDir" in command and "--assetIndex" in command:
+            assets_dir = Path(command[command.index("--assetsDir") + 1])
+            index_path = assets_dir / "indexes" / f"{command[command.index('--assetIndex') + 1]}.json"
+            if index_path.exists():
+                files.add(str(index_path))
+                with open(index_path, encoding="utf-8") as f:
+                    objects = json.load(f).get("objects", {})
+                for obj in objects.values():
+                    files.add(str(assets_dir / "objects" / obj["hash"][:2] / obj["hash"]))
+
+        return files
+
+    def take_snapshot(self, files):
+        snapshot = {}
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = [st.st_size, st.st_mtime_ns]
+        return snapshot
+
+    def snapshot_is_valid(self, snapshot):
+        """True si todos los archivos siguen existiendo con el mismo tamaño y mtime"""
+        for path, (size, mtime) in snapshot.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if st.st_size != size or st.st_mtime_ns != mtime:
+                return False
+        return True
+
+    # ----------------------------------------
+    # PLAN
+    # ----------------------------------------
+    def load(self, version):
+        try:
+            with open(self._plan_path(version), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_command(self, version, config):
+        """Devuelve el comando guardado si la instalación no cambió, o None"""
+        plan = self.load(version)
+        if not plan or plan.get("key") != self.launch_key(version, config):
+            return None
+        files = plan.get("files")
+        if not files or not self.snapshot_is_valid(files):
+            return None
+        return plan["command"]
+
+    def store(self, version, config, command):
+        """Guarda la foto de la instalación junto al comando de lanzamiento"""
+        plan = {
+            "key": self.launch_key(version, config),
+            "command": command,
+            "files": self.take_snapshot(self.collect_files(version, command)),
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = str(self._plan_path(version)) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(plan, f)
+        os.replace(temp_path, self._plan_path(version))
+
+    def invalidate(self, version):
+        try:
+            os.remove(self._plan_path(version))
+        except OSError:
+            pass
@@ -6,10 +6,14 @@ import shutil
 import threading
 import subprocess
 import platform
-import urllib.request
-import hashlib
+import time
 from pathlib import Path
 import minecraft_launcher_lib
+from updater import UpdateEngine
+from network import NetworkPolicy, STARTUP_DEADLINE
+from install_cache import LaunchCache
+from cache_manager import CacheManager
+from mod_sets import ModSetManager, select_mod_set
 
 # PyQt6 imports
 from PyQt6.QtWidgets import (
@@ -21,86 +25,6 @@ from PyQt6.QtGui import QPixmap, QPalette, QBrush, QColor, QLinearGradient, QMov
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QUrl
 from PyQt6.QtGui import QDesktopServices
 
-# ---------------------------------------------------------
-# UPDATE CHECKER
-# ---------------------------------------------------------
-class UpdateChecker:
-    def __init__(self, repo_url, local_dir):
-        self.repo_url = repo_url.rstrip('/')
-        self.local_dir = Path(local_dir)
-        self.raw_base = self.repo_url.replace('github.com', 'raw.githubusercontent.com') + '/main'
-        
-    def get_file_hash(self, filepath):
-        """Calcula el hash MD5 de un archivo"""
-        try:
-            with open(filepath, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except:
-            return None
-    
-    def check_updates(self):
-        """Verifica si hay archivos actualizados en el repositorio"""
-        try:
-            # Descargar la lista de archivos del repositorio
-            files_url = f"{self.repo_url}/contents"
-            with urllib.request.urlopen(files_url) as response:
-                repo_files = json.loads(response.read().decode())
-            
-            updated_files = []
-            
-            for file_info in repo_files:
-                if file_info['type'] == 'file':
-                    filename = file_info['name']
-                    remote_hash = file_info['sha']  # GitHub usa SHA para tracking
-                    local_file = self.local_dir / filename
-                    
-                    # Verificar si el archivo local existe y coincide
-                    if local_file.exists():
-                        # Para simplificar, comparamos tamaños primero
-                        local_size = local_file.stat().st_size
-                        remote_size = file_info['size']
-                        
-                        if local_size != remote_size:
-                            updated_files.append(filename)
-                        else:
-                            # Si el tamaño es igual, comparamos contenido
-                            local_hash = self.get_file_hash(local_file)
-                            if local_hash and local_hash != remote_hash:
-                                updated_files.append(filename)
-                    else:
-                        # Archivo nuevo que no existe localmente
-                        updated_files.append(filename)
-            
-            return updated_files
-            
-        except Exception as e:
-            print(f"Error checking updates: {e}")
-            return []
-    
-    def download_updated_files(self, files, progress_callback=None):
-        """Descarga los archivos actualizados"""
-        try:
-            total_files = len(files)
-            for index, filename in enumerate(files):
-                # Descargar archivo
-                file_url = f"{self.raw_base}/{filename}"
-                local_path = self.local_dir / filename
-                
-                # Crear directorio si no existe
-                local_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Descargar archivo
-                urllib.request.urlretrieve(file_url, local_path)
-                
-                if progress_callback:
-                    progress = int((index + 1) / total_files * 100)
-                    progress_callback(progress, f"Descargando {filename}")
-            
-            return True
-        except Exception as e:
-            print(f"Error downloading files: {e}")
-            return False
-
 # ---------------------------------------------------------
 # UPDATE DIALOGS
 # ---------------------------------------------------------
@@ -205,7 +129,7 @@ class Signals(QObject):
     status_updated = pyqtSignal(str)
     progress_updated = pyqtSignal(int)
     versions_loaded = pyqtSignal(list)
-    update_check_complete = pyqtSignal(list)  # Lista de archivos actualizados
+    update_check_complete = pyqtSignal(object)  # Lista de archivos actualizados, o None si no se pudo verificar
     update_download_complete = pyqtSignal(int)  # Número de archivos descargados
 
 # ---------------------------------------------------------
@@ -217,16 +141,17 @@ class ModernLauncher(QWidget):
         self.signals = Signals()
         self.setup_signals()
         self.launcher_version = "0.0.0"
-        self.mods_list = []
-        self.mods_base_url = ""
+        self.manifest = {}
         
-        # Configurar el verificador de actualizaciones
+        # Configurar la red y el verificador de actualizaciones
+        self.network = NetworkPolicy()
+        self.startup_deadline = time.monotonic() + STARTUP_DEADLINE
         self.repo_url = "https://github.com/king0piola/launcher-gts"
-        self.update_checker = UpdateChecker(self.repo_url, ".")
+        self.update_checker = UpdateEngine(self.repo_url, ".", policy=self.network)
         
         self.init_ui()
         self.load_config()
-        self.load_version_json()
+        self.load_version_json(deadline=self.startup_deadline)
         
         # Verificar actualizaciones al iniciar
         self.check_for_updates_on_start()
@@ -239,14 +164,18 @@ class ModernLauncher(QWidget):
     def _check_updates_thread(self):
         """Hilo para verificar actualizaciones"""
         try:
-            updated_files = self.update_checker.check_updates()
+            updated_files = self.update_checker.check_updates(deadline=self.startup_deadline)
             self.signals.update_check_complete.emit(updated_files)
         except Exception as e:
             self.update_status(f"Error buscando actualizaciones: {e}")
 
     def handle_update_check_result(self, updated_files):
         """Maneja el resultado de la verificación de actualizaciones"""
-        if updated_files:
+        if updated_files is None:
+            # No se pudo verificar: sin red o se agotó el tiempo de arranque
+            self.update_status("Sin conexión, usando datos locales")
+            threading.Thread(target=self.load_versions, daemon=True).start()
+        elif updated_files:
             self.update_status(f"Se encontraron {len(updated_files)} archivo(s) actualizado(s)")
             # Mostrar diálogo preguntando si descargar actualizaciones
             self.ask_download_updates(updated_files)
@@ -470,11 +399,10 @@ class ModernLauncher(QWidget):
         for icon_name, icon_url in icons.items():
             icon_path = f"assets/{icon_name}"
             if not os.path.exists(icon_path):
-                try:
-                    urllib.request.urlretrieve(icon_url, icon_path)
+                if self.update_checker.download_file(icon_url, icon_path, deadline=self.startup_deadline):
                     print(f"Descargado: {icon_name}")
-                except Exception as e:
-                    print(f"Error descargando {icon_name}: {e}")
+                else:
+                    print(f"Error descargando {icon_name}")
 
     # ----------------------------------------
     # STYLESHEET
@@ -594,7 +522,8 @@ class ModernLauncher(QWidget):
                 "minecraft_dir": str(Path.home() / ".gts_minecraft"),
                 "java_path": "java",
                 "max_ram": "4096",
-                "username": "JugadorGTS"
+                "username": "JugadorGTS",
+                "disk_budget_mb": 0
             }
             with open("config.json", "w") as f:
                 json.dump(cfg, f, indent=4)
@@ -604,15 +533,16 @@ class ModernLauncher(QWidget):
     # ---------------------------------------------------------
     # VERSION.JSON READING
     # ---------------------------------------------------------
-    def load_version_json(self):
-        url = "https://raw.githubusercontent.com/king0piola/launcher-gts/main/version.json"
+    def load_version_json(self, deadline=None):
+        url = self.update_checker.raw_base + "version.json"
+        # Si la red falla se usa la copia local de version.json
+        if self.update_checker.download_file(url, "version.json", deadline=deadline) is None:
+            self.update_status("Sin conexión, usando version.json local")
         try:
-            urllib.request.urlretrieve(url, "version.json")
             with open("version.json", "r", encoding="utf-8") as f:
                 data = json.load(f)
+            self.manifest = data
             self.launcher_version = data.get("launcher_version", "0.0.0")
-            self.mods_list = data.get("mods", [])
-            self.mods_base_url = data.get("mods_base_url", "")
             self.update_status(f"Launcher versión {self.launcher_version}")
         except Exception as e:
             self.update_status(f"Error leyendo version.json: {e}")
@@ -620,30 +550,50 @@ class ModernLauncher(QWidget):
     # ---------------------------------------------------------
     # DOWNLOAD MODS
     # ---------------------------------------------------------
-    def download_mods(self):
+    def download_mods(self, version):
         try:
-            mc_dir = self.get_mc_dir()
-            mods_dir = mc_dir / "mods"
-            mods_dir.mkdir(parents=True, exist_ok=True)
+            mod_sets = ModSetManager(self.get_mc_dir())
+
+            # Sin manifiesto cargado no se sabe qué mods tocan: no se cambia nada
+            if not self.manifest:
+                self.update_status("Sin manifiesto de mods, se mantienen los mods actuales")
+                return mod_sets.active_name()
+
+            # Solo el conjunto de mods de esta versión, en su propia carpeta
+            mod_set = select_mod_set(self.manifest, version)
+            mod_sets.activate(mod_set["name"])
+            mod_sets.prune(mod_set)
+            mods_dir = mod_sets.mods_dir
             
-            total_mods = len(self.mods_list)
+            missing_mods = mod_sets.missing(mod_set, self.update_checker.file_hash)
+            total_mods = len(missing_mods)
             downloaded_mods = 0
             
-            for mod in self.mods_list:
-                url = self.mods_base_url + mod
+            for mod in missing_mods:
+                url = mod_set["base_url"] + mod
                 path = mods_dir / mod
                 self.update_status(f"Descargando mod {mod} ({downloaded_mods+1}/{total_mods})")
-                urllib.request.urlretrieve(url, path)
+                digest = self.update_checker.download_file(url, str(path))
+                if digest is None:
+                    raise Exception(f"No se pudo descargar {mod}")
+                expected = mod_set["checks"].get(mod, {}).get("sha1")
+                if expected and digest != expected.lower():
+                    path.unlink()
+                    raise Exception(f"El hash de {mod} no coincide con el manifiesto")
+                mod_sets.record_installed(mod)
                 downloaded_mods += 1
                 
                 # Actualizar progreso
                 progress = int((downloaded_mods / total_mods) * 100)
                 self.signals.progress_updated.emit(progress)
             
-            self.update_status("Todos los mods descargados correctamente")
+            self.update_status(f"Mods listos: {mod_set['name']} ({len(mod_set['mods'])} mods)")
+            return mod_set["name"]
             
         except Exception as e:
+            # La carpeta de mods puede haber quedado a medias: no se lanza el juego
             self.update_status(f"Error descargando mods: {e}")
+            raise
 
     # ---------------------------------------------------------
     # LOAD MINECRAFT VERSIONS
@@ -685,36 +635,68 @@ class ModernLauncher(QWidget):
         try:
             version = self.version_box.currentText()
             mc_dir = self.get_mc_dir()
-            self.update_status(f"Instalando {version}...")
-            
-            minecraft_launcher_lib.install.install_minecraft_version(
-                version, mc_dir, callback=self._install_callback
-            )
+            launch_cache = LaunchCache(mc_dir)
+
+            # Si la instalación no cambió desde el último lanzamiento, no se reinstala
+            cmd = launch_cache.get_command(version, self.config)
+            if cmd is None:
+                self.update_status(f"Instalando {version}...")
+                minecraft_launcher_lib.install.install_minecraft_version(
+                    version, mc_dir, callback=self._install_callback
+                )
+            else:
+                self.update_status(f"{version} ya verificado, omitiendo instalación")
 
             # Mods
             self.update_status("Descargando mods...")
-            self.download_mods()
+            mod_set_name = self.download_mods(version)
 
             # Run game
             self.update_status("Iniciando Minecraft...")
-            options = {
-                "username": self.config["username"],
-                "uuid": "",
-                "token": "",
-                "jvmArguments": [
-                    f"-Xmx{self.config['max_ram']}M"
-                ]
-            }
-            cmd = minecraft_launcher_lib.command.get_minecraft_command(version, mc_dir, options)
-            cmd[0] = self.config["java_path"]
+            if cmd is None:
+                options = {
+                    "username": self.config["username"],
+                    "uuid": "",
+                    "token": "",
+                    "jvmArguments": [
+                        f"-Xmx{self.config['max_ram']}M"
+                    ]
+                }
+                cmd = minecraft_launcher_lib.command.get_minecraft_command(version, mc_dir, options)
+                cmd[0] = self.config["java_path"]
+                launch_cache.store(version, self.config, cmd)
             subprocess.Popen(cmd, cwd=mc_dir)
             self.update_status("Minecraft iniciado ✔️")
+
+            # Liberar espacio según el presupuesto de disco
+            self.cleanup_cache(version, mod_set_name)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
         finally:
             self.play_button.setEnabled(True)
 
+    # ---------------------------------------------------------
+    # DISK CACHE
+    # ---------------------------------------------------------
+    def cleanup_cache(self, version, mod_set_name):
+        try:
+            cache = CacheManager(self.get_mc_dir(), self.config.get("disk_budget_mb", 0))
+            cache.touch("versions", version)
+            keep = {("versions", version)}
+            if mod_set_name:
+                cache.touch("mods", mod_set_name)
+                keep.add(("mods", mod_set_name))
+
+            plan = cache.plan_cleanup(keep=keep)
+            if plan.is_empty():
+                return
+            self.update_status(f"Limpieza de caché: se liberarán {plan.describe()}")
+            cache.run_cleanup(plan)
+            self.update_status("Limpieza de caché completada")
+        except Exception as e:
+            self.update_status(f"Error limpiando caché: {e}")
+
     def _install_callback(self, type, cur, tot):
         if tot == 0:
             return
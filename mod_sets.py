@@ -0,0 +1,150 @@
+import os, json, shutil
+from pathlib import Path
+
+MODS_DIR = "mods"
+SETS_DIR = "mod_sets"
+ACTIVE_MARKER = ".mod_set"
+# Jars que descargó el launcher; los que puso el usuario a mano no se tocan
+INSTALLED_RECORD = ".mod_set_files"
+
+# Nombre de la carpeta de mods de launchers anteriores, sin marcador
+LEGACY_SET = "default"
+EMPTY_SET = "none"
+
+def _split_mods(entries):
+    """Separa nombres de jars y comprobaciones opcionales (sha1, size)"""
+    names, checks = [], {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            names.append(entry["file"])
+            checks[entry["file"]] = {k: entry[k] for k in ("sha1", "size") if k in entry}
+        else:
+            names.append(entry)
+    return names, checks
+
+def select_mod_set(manifest, version):
+    """Elige el conjunto de mods del manifiesto para una versión de Minecraft.
+
+    Formato de version.json:
+        "mod_sets": [
+            {"name": "1.20.1-fabric", "minecraft": ["1.20.1"], "loader": "fabric",
+             "base_url": "...",
+             "mods": ["mod1.jar", {"file": "mod2.jar", "sha1": "...", "size": 1234}]}
+        ]
+    "name" y "base_url" son opcionales. Sin "mod_sets" se usa la lista plana
+    "mods" para cualquier versión, como antes.
+
+    Un jar ya presente solo se vuelve a descargar si su entrada trae "sha1" o
+    "size" y no coinciden; un mod republicado con el mismo nombre necesita
+    alguno de los dos para llegar a quien ya lo tiene.
+    """
+    base_url = manifest.get("mods_base_url", "")
+    sets = manifest.get("mod_sets")
+    if sets is None:
+        names, checks = _split_mods(manifest.get("mods", []))
+        return {"name": LEGACY_SET, "loader": None, "mods": names, "checks": checks, "base_url": base_url}
+
+    for mod_set in sets:
+        minecraft = mod_set.get("minecraft", [])
+        if version in minecraft:
+            loader = mod_set.get("loader")
+            name = mod_set.get("name") or "-".join(filter(None, [minecraft[0], loader]))
+            names, checks = _split_mods(mod_set.get("mods", []))
+            return {
+                "name": name,
+                "loader": loader,
+                "mods": names,
+                "checks": checks,
+                "base_url": mod_set.get("base_url", base_url),
+            }
+
+    return {"name": EMPTY_SET, "loader": None, "mods": [], "checks": {}, "base_url": base_url}
+
+# ---------------------------------------------------------
+# MOD SET MANAGER
+# ---------------------------------------------------------
+class ModSetManager:
+    """Mantiene una carpeta de mods por conjunto y activa la elegida.
+
+    El conjunto activo vive en `mods` (donde lo busca el juego) y los demás en
+    `mod_sets/<nombre>`; cambiar de conjunto son dos renombrados de carpeta.
+    """
+
+    def __init__(self, mc_dir):
+        self.mc_dir = Path(mc_dir)
+        self.mods_dir = self.mc_dir / MODS_DIR
+        self.sets_dir = self.mc_dir / SETS_DIR
+
+    def active_name(self):
+        if not self.mods_dir.is_dir():
+            return None
+        try:
+            return (self.mods_dir / ACTIVE_MARKER).read_text(encoding="utf-8").strip() or LEGACY_SET
+        except OSError:
+            return LEGACY_SET
+
+    def activate(self, name):
+        """Deja en `mods` la carpeta del conjunto indicado"""
+        active = self.active_name()
+        if active == name:
+            return
+
+        self.sets_dir.mkdir(parents=True, exist_ok=True)
+        if active is not None:
+            parked = self.sets_dir / active
+            if parked.exists():
+                shutil.rmtree(parked)
+            os.replace(self.mods_dir, parked)
+
+        stored = self.sets_dir / name
+        if stored.is_dir():
+            os.replace(stored, self.mods_dir)
+        else:
+            self.mods_dir.mkdir(parents=True, exist_ok=True)
+        (self.mods_dir / ACTIVE_MARKER).write_text(name, encoding="utf-8")
+
+    def installed(self):
+        try:
+            with open(self.mods_dir / INSTALLED_RECORD, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_installed(self, names):
+        with open(self.mods_dir / INSTALLED_RECORD, "w", encoding="utf-8") as f:
+            json.dump(sorted(set(names)), f, indent=4)
+
+    def record_installed(self, mod):
+        """Anota un jar descargado por el launcher en la carpeta activa"""
+        self._save_installed(self.installed() + [mod])
+
+    def is_current(self, mod, check, file_hash):
+        """True si el jar existe y coincide con el size/sha1 del manifiesto, si los hay"""
+        path = self.mods_dir / mod
+        if not path.is_file() or path.stat().st_size == 0:
+            return False
+        if "size" in check and path.stat().st_size != check["size"]:
+            return False
+        if "sha1" in check and file_hash(path) != check["sha1"].lower():
+            return False
+        return True
+
+    def missing(self, mod_set, file_hash):
+        """Mods del conjunto que faltan o cambiaron en la carpeta activa"""
+        return [
+            mod for mod in mod_set["mods"]
+            if not self.is_current(mod, mod_set["checks"].get(mod, {}), file_hash)
+        ]
+
+    def prune(self, mod_set):
+        """Borra los jars instalados por el launcher que ya no están en el conjunto"""
+        kept = []
+        for mod in self.installed():
+            if mod in mod_set["mods"]:
+                kept.append(mod)
+                continue
+            try:
+                (self.mods_dir / mod).unlink()
+            except OSError:
+                pass
+        self._save_installed(kept)
@@ -0,0 +1,127 @@
+import time, threading, requests
+
+# Tiempo máximo (conexión, lectura) por petición, en segundos
+DEFAULT_TIMEOUT = (5, 15)
+
+# Tiempo total que el arranque puede dedicar a la red antes de usar la caché
+STARTUP_DEADLINE = 10
+
+# Margen para decidir que un timeout lo provocó el deadline y no la red
+DEADLINE_EPSILON = 0.1
+
+class NetworkUnavailable(Exception):
+    """La red no está disponible o se agotó el tiempo permitido"""
+
+# ---------------------------------------------------------
+# NETWORK POLICY
+# ---------------------------------------------------------
+class NetworkPolicy:
+    """Política central de red: timeouts, reintentos con backoff y circuit breaker.
+
+    Tras `failure_threshold` peticiones fallidas seguidas el circuito se abre y
+    las peticiones fallan al instante durante `cooldown` segundos. Agotar un
+    `deadline` no cuenta como fallo: solo lo hacen errores reales de red.
+
+    requests.Session no es segura entre hilos, así que cada hilo usa la suya.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=2, backoff=0.5,
+                 failure_threshold=3, cooldown=60):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0
+
+    @property
+    def session(self):
+        """Sesión del hilo actual, que reutiliza sus conexiones entre peticiones"""
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    # ----------------------------------------
+    # CIRCUIT BREAKER
+    # ----------------------------------------
+    def is_open(self):
+        """True si la red se considera caída y se deben saltar las peticiones"""
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+    def _record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0
+
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown
+
+    # ----------------------------------------
+    # DEADLINES
+    # ----------------------------------------
+    def check_deadline(self, deadline):
+        """Lanza NetworkUnavailable si ya pasó el límite y si no devuelve el tiempo restante"""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise NetworkUnavailable("Se agotó el tiempo de red permitido")
+        return remaining
+
+    def _timeout_for(self, deadline):
+        remaining = self.check_deadline(deadline)
+        if remaining is None:
+            return self.timeout
+        return tuple(min(t, remaining) for t in self.timeout)
+
+    # ----------------------------------------
+    # REQUESTS
+    # ----------------------------------------
+    def get(self, url, deadline=None, **kwargs):
+        """GET con timeout y reintentos; `deadline` es un instante de time.monotonic()"""
+        if self.is_open():
+            raise NetworkUnavailable("Sin conexión, se omite la petición")
+
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = self.backoff * 2 ** (attempt - 1)
+                if deadline is not None and deadline - time.monotonic() <= delay:
+                    break
+                time.sleep(delay)
+
+            if deadline is not None and deadline <= time.monotonic():
+                break
+            timeout = self._timeout_for(deadline)
+
+            try:
+                r = self.session.get(url, timeout=timeout, **kwargs)
+            except requests.Timeout as e:
+                # Un timeout que coincide con el fin del deadline no prueba que la red esté caída
+                if deadline is not None and deadline - time.monotonic() <= DEADLINE_EPSILON:
+                    break
+                last_error = e
+                continue
+            except requests.ConnectionError as e:
+                last_error = e
+                continue
+
+            # Los errores del servidor se reintentan, pero prueban que hay red
+            if r.status_code >= 500 and attempt < self.retries:
+                r.close()
+                continue
+            self._record_success()
+            return r
+
+        # Solo los fallos reales de red cuentan para el circuit breaker
+        if last_error is None:
+            raise NetworkUnavailable("Se agotó el tiempo de red permitido")
+        self._record_failure()
+        raise NetworkUnavailable(str(last_error))
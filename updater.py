@@ -1,37 +1,170 @@
-import os, json, requests, shutil
+import os, hashlib
+from network import NetworkPolicy
 
 GITHUB_REPO = "https://raw.githubusercontent.com/king0piola/launcher-gts/main/"
+GITHUB_URL = "https://github.com/king0piola/launcher-gts"
 
+# Tamaño de bloque para descargas y hashes: la memoria se mantiene plana
+# sin importar el tamaño del archivo
+CHUNK_SIZE = 64 * 1024
+
+# Únicos archivos que el launcher puede sobrescribir al actualizarse; los de
+# estado del usuario (config.json) nunca se tocan
 FILES_TO_CHECK = [
     "eventos.json",
     "mods/version.json",
-    "main.py"
+    "main.py",
+    "updater.py",
+    "network.py",
+    "install_cache.py",
+    "cache_manager.py",
+    "mod_sets.py"
 ]
 
-def download_file(url, dest):
-    try:
-        os.makedirs(os.path.dirname(dest), exist_ok=True)
-        r = requests.get(url)
-        if r.status_code == 200:
-            with open(dest, "wb") as f:
-                f.write(r.content)
-            return True
-    except Exception as e:
-        print("Error al descargar:", e)
-    return False
+# ---------------------------------------------------------
+# UPDATE ENGINE
+# ---------------------------------------------------------
+class UpdateEngine:
+    """Motor de actualizaciones: descargas en streaming sobre sesiones reutilizadas"""
 
-def check_for_updates():
-    updated_files = []
-    for file in FILES_TO_CHECK:
-        remote_url = GITHUB_REPO + file
-        local_path = os.path.join(os.getcwd(), file)
+    def __init__(self, repo_url=GITHUB_URL, local_dir=".", policy=None, files=FILES_TO_CHECK):
+        self.repo_url = repo_url.rstrip('/')
+        self.local_dir = local_dir
+        self.files = files
+        self.raw_base = self.repo_url.replace('github.com', 'raw.githubusercontent.com') + '/main/'
+        self.api_base = self.repo_url.replace('github.com', 'api.github.com/repos')
+        # La política da a cada hilo su propia sesión, que reutiliza las conexiones
+        self.policy = policy or NetworkPolicy()
 
-        temp_path = local_path + ".tmp"
-        if download_file(remote_url, temp_path):
-            # Comparar con el existente
-            if not os.path.exists(local_path) or open(local_path, "rb").read() != open(temp_path, "rb").read():
-                shutil.move(temp_path, local_path)
-                updated_files.append(file)
-            else:
+    # ----------------------------------------
+    # HASHES
+    # ----------------------------------------
+    def file_hash(self, path, algorithm="sha1"):
+        """Calcula el hash de un archivo leyendo por bloques"""
+        try:
+            h = hashlib.new(algorithm)
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+            return h.hexdigest()
+        except OSError:
+            return None
+
+    def git_blob_sha(self, path):
+        """Calcula el SHA de blob de git, el mismo que devuelve la API de GitHub"""
+        try:
+            h = hashlib.sha1(f"blob {os.path.getsize(path)}\0".encode())
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+            return h.hexdigest()
+        except OSError:
+            return None
+
+    # ----------------------------------------
+    # DOWNLOAD
+    # ----------------------------------------
+    def download_file(self, url, dest, algorithm="sha1", deadline=None):
+        """Descarga por bloques a un archivo temporal y lo mueve al destino.
+
+        Devuelve el hash del contenido descargado, o None si falló.
+        """
+        temp_path = dest + ".part"
+        try:
+            os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+            h = hashlib.new(algorithm)
+            with self.policy.get(url, deadline=deadline, stream=True) as r:
+                if r.status_code != 200:
+                    return None
+                with open(temp_path, "wb") as f:
+                    for chunk in r.iter_content(CHUNK_SIZE):
+                        self.policy.check_deadline(deadline)
+                        f.write(chunk)
+                        h.update(chunk)
+            os.replace(temp_path, dest)
+            return h.hexdigest()
+        except Exception as e:
+            print("Error al descargar:", e)
+            if os.path.exists(temp_path):
                 os.remove(temp_path)
-    return updated_files
+        return None
+
+    def sync_file(self, file):
+        """Descarga un archivo del repositorio y lo reemplaza solo si cambió"""
+        local_path = os.path.join(self.local_dir, file)
+        temp_path = local_path + ".tmp"
+        remote_hash = self.download_file(self.raw_base + file, temp_path)
+        if remote_hash is None:
+            return False
+        if remote_hash != self.file_hash(local_path):
+            os.replace(temp_path, local_path)
+            return True
+        os.remove(temp_path)
+        return False
+
+    def sync_files(self, files):
+        """Sincroniza una lista fija de archivos y devuelve los que cambiaron"""
+        return [file for file in files if self.sync_file(file)]
+
+    # ----------------------------------------
+    # REPOSITORY LISTING
+    # ----------------------------------------
+    def check_updates(self, deadline=None):
+        """Verifica cuáles de los archivos permitidos cambiaron en el repositorio.
+
+        Devuelve None si no se pudo verificar (sin red o sin tiempo).
+        """
+        try:
+            # Un solo listado recursivo del árbol cubre también las subcarpetas
+            with self.policy.get(f"{self.api_base}/git/trees/main?recursive=1", deadline=deadline) as r:
+                r.raise_for_status()
+                repo_files = r.json().get("tree", [])
+
+            updated_files = []
+            for file_info in repo_files:
+                if file_info['type'] != 'blob' or file_info['path'] not in self.files:
+                    continue
+                filename = file_info['path']
+                local_file = os.path.join(self.local_dir, filename)
+
+                # Comparamos tamaños primero y solo si coinciden calculamos el hash
+                if not os.path.exists(local_file) or os.path.getsize(local_file) != file_info['size']:
+                    updated_files.append(filename)
+                elif self.git_blob_sha(local_file) != file_info['sha']:
+                    updated_files.append(filename)
+
+            return updated_files
+
+        except Exception as e:
+            print(f"Error checking updates: {e}")
+            return None
+
+    def download_updated_files(self, files, progress_callback=None):
+        """Descarga los archivos actualizados"""
+        total_files = len(files)
+        for index, filename in enumerate(files):
+            local_path = os.path.join(self.local_dir, filename)
+            if self.download_file(self.raw_base + filename, local_path) is None:
+                print(f"Error downloading files: {filename}")
+                return False
+
+            if progress_callback:
+                progress = int((index + 1) / total_files * 100)
+                progress_callback(progress, f"Descargando {filename}")
+
+        return True
+
+_engine = None
+
+def get_engine():
+    """Devuelve el motor compartido del módulo"""
+    global _engine
+    if _engine is None:
+        _engine = UpdateEngine()
+    return _engine
+
+def download_file(url, dest):
+    return get_engine().download_file(url, dest) is not None
+
+def check_for_updates():
+    return get_engine().sync_files(get_engine().files)